@@ -5,17 +5,21 @@ Enhanced MDC protocol support for Samsung Business Displays
 """
 
 import asyncio
+import functools
+import itertools
+from collections import deque
 import socket
 import struct
 import logging
-from typing import Dict, List, Optional, Tuple, Any
+import math
+from typing import Dict, Iterable, List, Optional, Tuple, Any
 from dataclasses import dataclass
-from enum import Enum
+from enum import IntEnum
 import time
 
 logger = logging.getLogger(__name__)
 
-class MDCCommand(Enum):
+class MDCCommand(IntEnum):
     """Samsung MDC Protocol Commands for LHB55ECH"""
     POWER = 0x11
     VOLUME = 0x12
@@ -63,7 +67,7 @@ class MDCCommand(Enum):
     VIDEO_WALL_MODE = 0x84
     VIDEO_WALL_USER = 0x89
 
-class InputSource(Enum):
+class InputSource(IntEnum):
     """Input sources for Samsung LHB55ECH"""
     PC = 0x14
     DVI = 0x18
@@ -78,158 +82,295 @@ class InputSource(Enum):
     MEDIA_PLAYER_DVI = 0x61
     MAGIC_INFO = 0x20
 
-@dataclass
+@dataclass(frozen=True)
 class DisplayCapabilities:
     """Capabilities of Samsung LHB55ECH"""
     model: str = "LHB55ECH"
     screen_size: str = "55 inch"
     resolution: str = "1920x1080"
     brightness: int = 700  # cd/m²
-    supported_inputs: List[str] = None
+    supported_inputs: Tuple[str, ...] = (
+        "HDMI", "HDMI2", "DVI", "Display Port", 
+        "PC", "DTV", "MagicInfo", "Media Player"
+    )
     video_wall_support: bool = True
     max_video_wall_size: str = "10x10"
     network_capable: bool = True
     usb_playback: bool = True
+
+@functools.lru_cache(maxsize=1)
+def get_default_capabilities() -> DisplayCapabilities:
+    """Shared capabilities instance for LHB55ECH adapters"""
+    return DisplayCapabilities()
+
+# Sized to hold the fixed-payload packets (power, mute, info queries) for a
+# full range of display IDs without evicting them
+@functools.lru_cache(maxsize=4096)
+def build_mdc_packet(cmd: int, display_id: int, data: bytes = b'') -> bytes:
+    """Build an MDC frame; cached since POWER/MUTE/VOLUME frames repeat"""
+    data_length = len(data)
+    checksum = (0xAA + cmd + display_id + data_length + sum(data)) & 0xFF
+    return struct.pack(f'BBBB{data_length}sB', 0xAA, cmd, display_id,
+                       data_length, data, checksum)
+
+async def _read_mdc_frame(reader: asyncio.StreamReader) -> bytes:
+    """Read exactly one MDC frame: 4-byte header, payload, checksum"""
+    head = await reader.readexactly(4)
+    tail = await reader.readexactly(head[3] + 1)
+    return head + tail
+
+def parse_mdc_response(response: bytes, expected_display_id: int) -> Dict[str, Any]:
+    """Parse an MDC response frame addressed to expected_display_id"""
+    if len(response) < 4:
+        return {'success': False, 'error': 'Response too short'}
+    
+    header, cmd, display_id, data_length = struct.unpack_from('BBBB', response)
+    
+    if header != 0xAA:
+        return {'success': False, 'error': 'Invalid header'}
+    
+    if display_id != expected_display_id:
+        return {'success': False, 'error': 'Display ID mismatch'}
+    
+    if len(response) < 5 + data_length:
+        return {'success': False, 'error': 'Response too short'}
     
-    def __post_init__(self):
-        if self.supported_inputs is None:
-            self.supported_inputs = [
-                "HDMI", "HDMI2", "DVI", "Display Port", 
-                "PC", "DTV", "MagicInfo", "Media Player"
-            ]
+    data = response[4:4+data_length]
+    checksum = response[4+data_length]
+    
+    # Verify checksum
+    expected_checksum = (header + cmd + display_id + data_length +
+                         sum(memoryview(response)[4:4+data_length])) & 0xFF
+    if checksum != expected_checksum:
+        return {'success': False, 'error': 'Checksum mismatch'}
+    
+    return {
+        'success': True,
+        'command': cmd,
+        'data': data,
+        'raw_response': response
+    }
+
+# Discovery probes address display ID 1, so the same packet serves every IP
+_DISCOVERY_PROBE_PACKET = build_mdc_packet(MDCCommand.CURRENT_TEMP, 1)
+
+async def _probe_ip(ip: str, port: int = 1515, timeout: float = 0.5,
+                    packet: bytes = _DISCOVERY_PROBE_PACKET) -> Dict[str, Any]:
+    """Send one temperature query on a short-lived connection and parse the reply"""
+    async def _query() -> bytes:
+        reader, writer = await asyncio.open_connection(ip, port)
+        try:
+            writer.write(packet)
+            await writer.drain()
+            return await _read_mdc_frame(reader)
+        finally:
+            writer.close()
+    
+    try:
+        response = await asyncio.wait_for(_query(), timeout=timeout)
+    except (asyncio.TimeoutError, asyncio.IncompleteReadError, OSError) as e:
+        return {'success': False, 'error': str(e) or type(e).__name__}
+    
+    result = parse_mdc_response(response, packet[2])
+    if result['success'] and len(result['data']) >= 1:
+        result['temperature'] = result['data'][0]
+    return result
 
 class SamsungLHB55ECHAdapter:
     """Enhanced adapter for Samsung LHB55ECH Business Display"""
     
+    __slots__ = ('display_id', 'ip', 'port', 'capabilities',
+                 'last_response_time', 'error_count', 'max_retries',
+                 'reader', 'writer', '_lock')
+    
     def __init__(self, display_id: int, ip: str, port: int = 1515):
         self.display_id = display_id
         self.ip = ip
         self.port = port
-        self.capabilities = DisplayCapabilities()
-        self.connected = False
+        self.capabilities = get_default_capabilities()
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        # Replies are matched to requests by order, so one exchange at a time per link
+        self._lock = asyncio.Lock()
         self.last_response_time = None
         self.error_count = 0
-        self.max_retries = 3
+        self.max_retries = 2
         
     async def connect(self) -> bool:
         """Establish connection to display"""
         try:
             self.reader, self.writer = await asyncio.wait_for(
                 asyncio.open_connection(self.ip, self.port),
-                timeout=10.0
+                timeout=2.0  # A display that can't finish a handshake in 2 s is gone
             )
-            self.connected = True
+            # MDC frames are tiny request/response packets: disable Nagle, keep idle links alive
+            sock = self.writer.get_extra_info('socket')
+            if sock is not None:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
             self.error_count = 0
             logger.info(f"Connected to Samsung LHB55ECH at {self.ip}:{self.port}")
             return True
         except Exception as e:
             logger.error(f"Failed to connect to display {self.display_id}: {e}")
-            self.connected = False
             return False
     
     async def disconnect(self):
         """Close connection to display"""
-        if hasattr(self, 'writer') and self.writer:
+        if self.writer is not None:
             self.writer.close()
             await self.writer.wait_closed()
-        self.connected = False
+            self.reader = self.writer = None
+    
+    @property
+    def connected(self) -> bool:
+        """Whether the adapter holds an open link to the display"""
+        return not self._needs_connect()
+    
+    def _needs_connect(self) -> bool:
+        """True when there is no usable link, including one the peer has half-closed"""
+        return self.writer is None or self.writer.is_closing()
     
     def _create_mdc_packet(self, command: MDCCommand, data: bytes = b'') -> bytes:
         """Create MDC protocol packet"""
-        header = 0xAA
-        cmd = command.value
-        display_id = self.display_id
-        data_length = len(data)
-        
-        # Calculate checksum
-        checksum = (header + cmd + display_id + data_length + sum(data)) & 0xFF
-        
-        packet = struct.pack('BBBB', header, cmd, display_id, data_length)
-        packet += data
-        packet += struct.pack('B', checksum)
-        
-        return packet
+        return build_mdc_packet(command, self.display_id, data)
     
     def _parse_mdc_response(self, response: bytes) -> Dict[str, Any]:
         """Parse MDC protocol response"""
-        if len(response) < 4:
-            return {'success': False, 'error': 'Response too short'}
+        return parse_mdc_response(response, self.display_id)
+    
+    async def _read_frame(self) -> bytes:
+        """Read exactly one MDC frame from the adapter's connection"""
+        return await _read_mdc_frame(self.reader)
+    
+    def _drop_out_of_step_link(self, sent: int, received: int):
+        """Close a link whose replies no longer line up with its requests"""
+        logger.warning(f"Display {self.display_id} answered command 0x{received:02X} "
+                       f"to 0x{sent:02X}; dropping out-of-step connection")
+        self.writer.close()
+        self.error_count += 1
+    
+    async def _exchange(self, packets: List[bytes], timeout: float = 5.0) -> List[Dict[str, Any]]:
+        """Write packets back-to-back, then read and parse one response per packet
+        
+        The caller must hold self._lock for the whole exchange.
+        """
+        self.writer.writelines(packets)
+        await self.writer.drain()
         
+        results = []
         try:
-            header, cmd, display_id, data_length = struct.unpack('BBBB', response[:4])
-            
-            if header != 0xAA:
-                return {'success': False, 'error': 'Invalid header'}
-            
-            if display_id != self.display_id:
-                return {'success': False, 'error': 'Display ID mismatch'}
-            
-            data = response[4:4+data_length] if data_length > 0 else b''
-            checksum = response[4+data_length] if len(response) > 4+data_length else 0
-            
-            # Verify checksum
-            expected_checksum = (header + cmd + display_id + data_length + sum(data)) & 0xFF
-            if checksum != expected_checksum:
-                return {'success': False, 'error': 'Checksum mismatch'}
-            
-            return {
-                'success': True,
-                'command': cmd,
-                'data': data,
-                'raw_response': response
-            }
-            
-        except Exception as e:
-            return {'success': False, 'error': f'Parse error: {str(e)}'}
+            for packet in packets:
+                response = await asyncio.wait_for(self._read_frame(), timeout=timeout)
+                result = self._parse_mdc_response(response)
+                if result['success'] and result['command'] != packet[1]:
+                    self._drop_out_of_step_link(packet[1], result['command'])
+                    results.extend({'success': False, 'error': 'Response command mismatch'}
+                                   for _ in range(len(packets) - len(results)))
+                    return results
+                results.append(result)
+        except asyncio.CancelledError:
+            # Replies still in flight would be read as answers to later commands
+            self.writer.close()
+            raise
+        self.last_response_time = time.time()
+        return results
     
     async def send_command(self, command: MDCCommand, data: bytes = b'', 
                           expect_response: bool = True) -> Dict[str, Any]:
         """Send command to display with enhanced error handling"""
         for attempt in range(self.max_retries):
             try:
-                if not self.connected:
-                    if not await self.connect():
-                        continue
-                
-                packet = self._create_mdc_packet(command, data)
-                
-                # Send packet
-                self.writer.write(packet)
-                await self.writer.drain()
-                
-                if expect_response:
-                    # Read response with timeout
+                async with self._lock:
+                    if self._needs_connect():
+                        if not await self.connect():
+                            continue
+                    
+                    packet = self._create_mdc_packet(command, data)
+                    
+                    response = None
+                    read_task = None
                     try:
-                        response = await asyncio.wait_for(
-                            self.reader.read(1024), 
-                            timeout=5.0
-                        )
-                        
-                        if response:
-                            self.last_response_time = time.time()
-                            result = self._parse_mdc_response(response)
-                            if result['success']:
-                                return result
-                            else:
-                                logger.warning(f"Command failed: {result['error']}")
+                        # Send packet
+                        self.writer.write(packet)
+                        await self.writer.drain()
                         
-                    except asyncio.TimeoutError:
-                        logger.warning(f"Timeout waiting for response from display {self.display_id}")
-                        self.connected = False
-                        continue
-                
-                return {'success': True, 'message': 'Command sent successfully'}
+                        # Always read the reply, even if the caller doesn't want it, so the next
+                        # command gets its own; one read spans both waits so a late frame isn't split
+                        read_task = asyncio.ensure_future(self._read_frame())
+                        try:
+                            response = await asyncio.wait_for(asyncio.shield(read_task), timeout=5.0)
+                        except asyncio.TimeoutError:
+                            logger.warning(f"Slow response from display {self.display_id}, waiting longer")
+                            try:
+                                response = await asyncio.wait_for(read_task, timeout=2.0)
+                            except asyncio.TimeoutError:
+                                logger.warning(f"Timeout waiting for response from display {self.display_id}")
+                                self.error_count += 1
+                                return {'success': False, 'error': 'Response timeout'}
+                    finally:
+                        # Leaving without the reply (timeout, error or cancellation) drops the
+                        # link; a reply arriving later would be read as the next command's response
+                        if response is None:
+                            if read_task is not None:
+                                read_task.cancel()
+                            self.writer.close()
+                    
+                    self.last_response_time = time.time()
+                    result = self._parse_mdc_response(response)
+                    if result['success'] and result['command'] != command:
+                        self._drop_out_of_step_link(command, result['command'])
+                        return {'success': False, 'error': 'Response command mismatch'}
+                    
+                    if not expect_response:
+                        return {'success': True, 'message': 'Command sent successfully'}
+                    
+                    if result['success']:
+                        return result
+                    else:
+                        logger.warning(f"Command failed: {result['error']}")
+                    
+                    return {'success': True, 'message': 'Command sent successfully'}
                 
-            except Exception as e:
+            except (ConnectionError, OSError, asyncio.IncompleteReadError) as e:
                 logger.error(f"Command attempt {attempt + 1} failed: {e}")
-                self.connected = False
+                self.writer.close()
                 self.error_count += 1
                 
                 if attempt < self.max_retries - 1:
-                    await asyncio.sleep(1)  # Wait before retry
+                    await asyncio.sleep(0.2)  # Brief pause before reconnecting
+            
+            except Exception as e:
+                logger.error(f"Command to display {self.display_id} failed: {e}")
+                if self.writer is not None:
+                    self.writer.close()
+                self.error_count += 1
+                return {'success': False, 'error': str(e) or type(e).__name__}
         
         return {'success': False, 'error': f'Failed after {self.max_retries} attempts'}
     
+    async def batch(self, commands: List[Tuple[MDCCommand, bytes]]) -> List[Dict[str, Any]]:
+        """Send several commands in one write burst and return their responses in order"""
+        async with self._lock:
+            if self._needs_connect() and not await self.connect():
+                return [{'success': False, 'error': 'Not connected'} for _ in commands]
+            
+            try:
+                return await self._exchange([self._create_mdc_packet(command, data)
+                                             for command, data in commands])
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError, OSError) as e:
+                logger.warning(f"Batch failed for display {self.display_id}: {e}")
+                # Unread replies would desync framing for later commands
+                self.writer.close()
+                self.error_count += 1
+                error = str(e) or type(e).__name__
+                return [{'success': False, 'error': error} for _ in commands]
+    
+    async def probe(self, timeout: float = 0.5) -> Dict[str, Any]:
+        """Quick reachability check: one temperature query on a short-lived connection"""
+        return await _probe_ip(self.ip, self.port, timeout,
+                               self._create_mdc_packet(MDCCommand.CURRENT_TEMP))
+    
     async def power_on(self) -> Dict[str, Any]:
         """Turn display power on"""
         return await self.send_command(MDCCommand.POWER, b'\x01')
@@ -252,7 +393,7 @@ class SamsungLHB55ECHAdapter:
     
     async def set_input_source(self, source: InputSource) -> Dict[str, Any]:
         """Set input source"""
-        return await self.send_command(MDCCommand.INPUT_SOURCE, bytes([source.value]))
+        return await self.send_command(MDCCommand.INPUT_SOURCE, bytes([source]))
     
     async def get_temperature(self) -> Dict[str, Any]:
         """Get current display temperature"""
@@ -314,35 +455,41 @@ class SamsungLHB55ECHAdapter:
         }
         
         try:
-            # Test connection
-            if not self.connected:
-                await self.connect()
-            
-            if self.connected:
-                health_data['connected'] = True
+            async with self._lock:
+                # Test connection
+                if self._needs_connect():
+                    await self.connect()
                 
-                # Test responsiveness with temperature query
-                temp_result = await self.get_temperature()
-                if temp_result['success']:
-                    health_data['responsive'] = True
-                    health_data['temperature'] = temp_result.get('temperature')
+                if self._needs_connect():
+                    return health_data
+                health_data['connected'] = True
                 
-                # Get device info (non-critical)
+                # Pipeline the info queries: one write burst, then read in order
                 try:
-                    model_result = await self.get_model_number()
-                    if model_result['success']:
-                        health_data['model'] = model_result.get('model_number')
-                    
-                    serial_result = await self.get_serial_number()
-                    if serial_result['success']:
-                        health_data['serial_number'] = serial_result.get('serial_number')
-                    
-                    version_result = await self.get_software_version()
-                    if version_result['success']:
-                        health_data['software_version'] = version_result.get('software_version')
-                        
-                except Exception as e:
-                    logger.debug(f"Non-critical info gathering failed: {e}")
+                    temp_result, model_result, serial_result, version_result = \
+                        await self._exchange([
+                            self._create_mdc_packet(MDCCommand.CURRENT_TEMP),
+                            self._create_mdc_packet(MDCCommand.MODEL_NUMBER),
+                            self._create_mdc_packet(MDCCommand.SERIAL_NUMBER),
+                            self._create_mdc_packet(MDCCommand.SOFTWARE_VERSION),
+                        ])
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, OSError) as e:
+                    logger.warning(f"Health query failed for display {self.display_id}: {e}")
+                    self.writer.close()
+                    self.error_count += 1
+                    health_data['error'] = str(e) or type(e).__name__
+                    return health_data
+            
+            if temp_result['success'] and len(temp_result['data']) >= 1:
+                health_data['responsive'] = True
+                health_data['temperature'] = temp_result['data'][0]
+            
+            # Device info (non-critical)
+            for key, result in (('model', model_result),
+                                ('serial_number', serial_result),
+                                ('software_version', version_result)):
+                if result['success']:
+                    health_data[key] = result['data'].decode('ascii', errors='ignore').strip()
         
         except Exception as e:
             logger.error(f"Health check failed for display {self.display_id}: {e}")
@@ -351,10 +498,42 @@ class SamsungLHB55ECHAdapter:
         return health_data
 
 
+def _default_service_config() -> Dict[str, Dict]:
+    """Fresh defaults for the non-display sections of a generated configuration"""
+    return {
+        'magicinfo': {
+            'enabled': False,
+            'server_url': '',
+            'username': 'admin',
+            'password': '',
+            'api_key': ''
+        },
+        'optisigns': {
+            'enabled': False,
+            'server_url': '',
+            'api_key': '',
+            'username': 'admin',
+            'password': ''
+        },
+        'content': {
+            'static_path': './static_content/',
+            'upload_path': './uploads/',
+            'max_file_size': 100,
+            'allowed_extensions': ['.jpg', '.jpeg', '.png', '.gif', '.mp4', '.avi', '.mov', '.webm']
+        },
+        'server': {
+            'host': '0.0.0.0',
+            'port': 5000,
+            'debug': False
+        }
+    }
+
 # Configuration Wizard Component
 class VideoWallConfigWizard:
     """Interactive configuration wizard for video wall setup"""
     
+    __slots__ = ('config', 'discovery_concurrency', 'probe_timeout')
+    
     def __init__(self):
         self.config = {
             'displays': {},
@@ -363,6 +542,8 @@ class VideoWallConfigWizard:
             'content': {},
             'server': {}
         }
+        self.discovery_concurrency = 32
+        self.probe_timeout = 0.5  # seconds
     
     async def discover_displays(self, ip_range: str = "192.168.1.1-254") -> List[Dict]:
         """Discover Samsung displays on network"""
@@ -376,37 +557,47 @@ class VideoWallConfigWizard:
             # Single IP
             return await self._test_single_ip(ip_range)
         
-        # Test IP range
-        tasks = []
-        for i in range(start, end + 1):
-            ip = f"{base_ip}.{i}"
-            tasks.append(self._test_single_ip(ip))
+        # Test IP range, bounding the number of in-flight connects
+        sem = asyncio.Semaphore(self.discovery_concurrency)
+        tasks = [self._test_single_ip(f"{base_ip}.{i}", sem) for i in range(start, end + 1)]
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        for result in results:
+        for future in asyncio.as_completed(tasks):
+            try:
+                result = await future
+            except Exception:
+                continue
             if isinstance(result, dict) and result.get('responsive'):
                 discovered.append(result)
         
         return discovered
     
-    async def _test_single_ip(self, ip: str) -> Optional[Dict]:
+    async def _test_single_ip(self, ip: str, 
+                              sem: Optional[asyncio.Semaphore] = None) -> Optional[Dict]:
         """Test if IP has a responsive Samsung display"""
-        try:
-            adapter = SamsungLHB55ECHAdapter(1, ip)  # Use ID 1 for discovery
-            health = await adapter.health_check()
-            await adapter.disconnect()
+        if sem is None:
+            sem = asyncio.Semaphore(1)
+        
+        async with sem:
+            # Single-query probe first; only displays that answer get an adapter
+            probe = await _probe_ip(ip, timeout=self.probe_timeout)
+            if not probe['success']:
+                return None
             
-            if health['responsive']:
-                return {
-                    'ip': ip,
-                    'model': health.get('model', 'Samsung Display'),
-                    'serial_number': health.get('serial_number'),
-                    'temperature': health.get('temperature'),
-                    'responsive': True
-                }
-        except Exception:
-            pass
+            try:
+                adapter = SamsungLHB55ECHAdapter(1, ip)  # Use ID 1 for discovery
+                health = await adapter.health_check()
+                await adapter.disconnect()
+                
+                if health['responsive']:
+                    return {
+                        'ip': ip,
+                        'model': health.get('model', 'Samsung Display'),
+                        'serial_number': health.get('serial_number'),
+                        'temperature': health.get('temperature'),
+                        'responsive': True
+                    }
+            except Exception:
+                pass
         
         return None
     
@@ -424,39 +615,12 @@ class VideoWallConfigWizard:
                     'vertical': v_count
                 }
             },
-            'magicinfo': {
-                'enabled': False,
-                'server_url': '',
-                'username': 'admin',
-                'password': '',
-                'api_key': ''
-            },
-            'optisigns': {
-                'enabled': False,
-                'server_url': '',
-                'api_key': '',
-                'username': 'admin',
-                'password': ''
-            },
-            'content': {
-                'static_path': './static_content/',
-                'upload_path': './uploads/',
-                'max_file_size': 100,
-                'allowed_extensions': ['.jpg', '.jpeg', '.png', '.gif', '.mp4', '.avi', '.mov', '.webm']
-            },
-            'server': {
-                'host': '0.0.0.0',
-                'port': 5000,
-                'debug': False
-            }
+            **_default_service_config()
         }
         
-        # Configure displays
-        for i, display in enumerate(discovered_displays[:h_count * v_count], 1):
-            # Calculate video wall position
-            h_pos = ((i - 1) % h_count) + 1
-            v_pos = ((i - 1) // h_count) + 1
-            
+        # Configure displays; positions come from the cached row-major grid
+        positions = _grid_positions(h_count, v_count)
+        for i, (display, (h_pos, v_pos)) in enumerate(zip(discovered_displays, positions), 1):
             config['displays'][i] = {
                 'name': f'Display {i} - {display.get("model", "Samsung")}',
                 'ip': display['ip'],
@@ -477,6 +641,12 @@ class VideoWallConfigWizard:
 class MonitoringDashboard:
     """Real-time monitoring dashboard for video wall system"""
     
+    __slots__ = ('adapters', 'monitoring_active', 'monitoring_interval',
+                 'alert_thresholds', 'alerts', '_recent_alert_ts',
+                 '_alert_seq', '_level_prefix', '_alert_counts',
+                 '_recent_alert_levels', '_connected_displays',
+                 '_responsive_displays')
+    
     def __init__(self, display_adapters: Dict[int, SamsungLHB55ECHAdapter]):
         self.adapters = display_adapters
         self.monitoring_active = False
@@ -487,7 +657,16 @@ class MonitoringDashboard:
             'response_timeout': 10,  # seconds
             'error_count_warning': 3
         }
-        self.alerts = []
+        self.alerts = deque(maxlen=100)
+        self._recent_alert_ts: Dict[str, float] = {}
+        self._alert_seq = itertools.count()
+        self._level_prefix = {'critical': 'C', 'warning': 'W', 'error': 'E'}
+        
+        # Running counters so get_system_status never sweeps adapters or alerts
+        self._alert_counts = {'critical': 0, 'warning': 0, 'error': 0}
+        self._recent_alert_levels = deque()  # (timestamp, level) within the last hour, capped like alerts
+        self._connected_displays = set()
+        self._responsive_displays = set()
     
     async def start_monitoring(self):
         """Start continuous monitoring"""
@@ -534,6 +713,16 @@ class MonitoringDashboard:
         display_id = health_data['display_id']
         current_time = time.time()
         
+        # Track connectivity from the latest health check
+        if health_data.get('connected'):
+            self._connected_displays.add(display_id)
+        else:
+            self._connected_displays.discard(display_id)
+        if health_data.get('responsive'):
+            self._responsive_displays.add(display_id)
+        else:
+            self._responsive_displays.discard(display_id)
+        
         # Check temperature
         if health_data.get('temperature'):
             temp = health_data['temperature']
@@ -560,64 +749,92 @@ class MonitoringDashboard:
     
     def _add_alert(self, level: str, message: str):
         """Add alert to the system"""
-        alert = {
-            'level': level,
-            'message': message,
-            'timestamp': time.time(),
-            'id': f"{level}_{hash(message)}_{int(time.time())}"
-        }
+        now = time.time()
         
         # Avoid duplicate alerts (same message within 5 minutes)
-        cutoff_time = time.time() - 300
-        existing_alerts = [a for a in self.alerts if a['timestamp'] > cutoff_time and a['message'] == message]
-        
-        if not existing_alerts:
-            self.alerts.append(alert)
-            logger.warning(f"ALERT [{level.upper()}]: {message}")
-            
-            # Keep only last 100 alerts
-            if len(self.alerts) > 100:
-                self.alerts = self.alerts[-100:]
+        if now - self._recent_alert_ts.get(message, 0.0) < 300:
+            return
+        self._recent_alert_ts[message] = now
+        
+        # Prune expired dedup entries every 100 distinct messages
+        if len(self._recent_alert_ts) % 100 == 0:
+            cutoff_time = now - 300
+            self._recent_alert_ts = {m: ts for m, ts in self._recent_alert_ts.items()
+                                     if ts > cutoff_time}
+        
+        # deque(maxlen=100) keeps only the last 100 alerts
+        self.alerts.append({
+            'level': level,
+            'message': message,
+            'timestamp': now,
+            'id': (self._level_prefix[level], next(self._alert_seq))
+        })
+        self._expire_recent_alerts(now)
+        if len(self._recent_alert_levels) == self.alerts.maxlen:
+            # Same cap as self.alerts: the window counts only the alerts still kept
+            self._alert_counts[self._recent_alert_levels.popleft()[1]] -= 1
+        self._alert_counts[level] += 1
+        self._recent_alert_levels.append((now, level))
+        logger.warning(f"ALERT [{level.upper()}]: {message}")
+    
+    def _expire_recent_alerts(self, now: float):
+        """Drop alerts older than one hour from the running counters"""
+        cutoff_time = now - 3600
+        recent = self._recent_alert_levels
+        while recent and recent[0][0] < cutoff_time:
+            self._alert_counts[recent.popleft()[1]] -= 1
     
     def get_current_alerts(self, level_filter: Optional[str] = None) -> List[Dict]:
         """Get current alerts, optionally filtered by level"""
         if level_filter:
             return [a for a in self.alerts if a['level'] == level_filter]
-        return self.alerts.copy()
+        return list(self.alerts)
     
     def get_system_status(self) -> Dict:
         """Get overall system status"""
-        total_displays = len(self.adapters)
-        connected_displays = 0
-        responsive_displays = 0
-        avg_temperature = 0
-        temp_count = 0
+        self._expire_recent_alerts(time.time())
+        recent = self._recent_alert_levels
         
-        recent_alerts = [a for a in self.alerts if time.time() - a['timestamp'] < 3600]  # Last hour
+        # Forget displays that have been removed from the shared adapters dict
+        self._connected_displays.intersection_update(self.adapters)
+        self._responsive_displays.intersection_update(self.adapters)
         
-        for adapter in self.adapters.values():
-            if hasattr(adapter, 'connected') and adapter.connected:
-                connected_displays += 1
-            
-            # This would need to be stored from recent health checks
-            # For now, we'll use placeholder logic
+        total_displays = len(self.adapters)
+        connected_displays = len(self._connected_displays)
+        critical_alerts = self._alert_counts['critical']
         
         return {
             'total_displays': total_displays,
             'connected_displays': connected_displays,
-            'responsive_displays': responsive_displays,
+            'responsive_displays': len(self._responsive_displays),
             'connection_rate': connected_displays / total_displays if total_displays > 0 else 0,
-            'recent_alerts': len(recent_alerts),
-            'critical_alerts': len([a for a in recent_alerts if a['level'] == 'critical']),
-            'warning_alerts': len([a for a in recent_alerts if a['level'] == 'warning']),
-            'system_health': 'healthy' if len(recent_alerts) == 0 else 'warning' if len([a for a in recent_alerts if a['level'] == 'critical']) == 0 else 'critical'
+            'recent_alerts': len(recent),
+            'critical_alerts': critical_alerts,
+            'warning_alerts': self._alert_counts['warning'],
+            'system_health': 'healthy' if not recent else 'warning' if critical_alerts == 0 else 'critical'
         }
 
 
+@functools.lru_cache(maxsize=None)
+def _grid_positions(h_count: int, v_count: int) -> Tuple[Tuple[int, int], ...]:
+    """Row-major (horizontal, vertical) positions for an h_count x v_count grid"""
+    return tuple((i % h_count + 1, i // h_count + 1) for i in range(h_count * v_count))
+
+
+def _collect_results(display_ids: Iterable[int], results: List[Any]) -> Dict[int, Dict]:
+    """Pair gather() results with display IDs, turning exceptions into failures"""
+    return {
+        display_id: {'success': False, 'error': str(result)} if isinstance(result, BaseException) else result
+        for display_id, result in zip(display_ids, results)
+    }
+
+
 # Video Wall Layout Manager
 class VideoWallLayoutManager:
     """Manage video wall layouts and content distribution"""
     
+    __slots__ = ('displays', 'layouts')
+    
     def __init__(self, displays: Dict[int, Dict]):
         self.displays = displays
         self.layouts = {}
@@ -627,35 +844,35 @@ class VideoWallLayoutManager:
         """Calculate possible video wall layouts"""
         display_count = len(self.displays)
         
-        # Find all possible rectangular layouts
-        for h in range(1, display_count + 1):
+        # Find all possible rectangular layouts; divisors come in (h, N/h) pairs
+        horizontal_counts = []
+        for h in range(1, math.isqrt(display_count) + 1):
             if display_count % h == 0:
-                v = display_count // h
-                layout_name = f"{h}x{v}"
-                self.layouts[layout_name] = {
-                    'horizontal': h,
-                    'vertical': v,
-                    'total_displays': display_count,
-                    'aspect_ratio': h / v,
-                    'display_mapping': self._create_display_mapping(h, v)
-                }
+                horizontal_counts.append(h)
+                if h * h != display_count:
+                    horizontal_counts.append(display_count // h)
+        
+        for h in sorted(horizontal_counts):
+            v = display_count // h
+            layout_name = f"{h}x{v}"
+            self.layouts[layout_name] = {
+                'horizontal': h,
+                'vertical': v,
+                'total_displays': display_count,
+                'aspect_ratio': h / v,
+                'display_mapping': self._create_display_mapping(h, v)
+            }
     
     def _create_display_mapping(self, h_count: int, v_count: int) -> Dict:
         """Create mapping of display positions"""
-        mapping = {}
-        display_ids = list(self.displays.keys())
-        
-        for i, display_id in enumerate(display_ids[:h_count * v_count]):
-            h_pos = (i % h_count) + 1
-            v_pos = (i // h_count) + 1
-            
-            mapping[display_id] = {
+        return {
+            display_id: {
                 'horizontal_position': h_pos,
                 'vertical_position': v_pos,
                 'grid_position': (h_pos, v_pos)
             }
-        
-        return mapping
+            for display_id, (h_pos, v_pos) in zip(self.displays, _grid_positions(h_count, v_count))
+        }
     
     def get_available_layouts(self) -> Dict:
         """Get all available video wall layouts"""
@@ -670,20 +887,24 @@ class VideoWallLayoutManager:
         layout = self.layouts[layout_name]
         results = {}
         
+        # Configure all displays concurrently; each adapter has one command in flight
+        display_ids = []
+        coros = []
         for display_id, position in layout['display_mapping'].items():
             if display_id in adapters:
-                adapter = adapters[display_id]
-                result = await adapter.set_video_wall_mode(
+                display_ids.append(display_id)
+                coros.append(adapters[display_id].set_video_wall_mode(
                     enabled=True,
                     h_monitors=layout['horizontal'],
                     v_monitors=layout['vertical'],
                     h_position=position['horizontal_position'],
                     v_position=position['vertical_position']
-                )
-                results[display_id] = result
+                ))
             else:
                 results[display_id] = {'success': False, 'error': 'Adapter not found'}
         
+        results.update(_collect_results(display_ids, await asyncio.gather(*coros, return_exceptions=True)))
+        
         return {
             'success': all(r.get('success', False) for r in results.values()),
             'layout': layout_name,
@@ -692,11 +913,12 @@ class VideoWallLayoutManager:
     
     async def disable_video_wall(self, adapters: Dict[int, SamsungLHB55ECHAdapter]) -> Dict:
         """Disable video wall mode on all displays"""
-        results = {}
-        
-        for display_id, adapter in adapters.items():
-            result = await adapter.set_video_wall_mode(enabled=False)
-            results[display_id] = result
+        results = _collect_results(
+            adapters.keys(),
+            await asyncio.gather(*(adapter.set_video_wall_mode(enabled=False)
+                                   for adapter in adapters.values()),
+                                 return_exceptions=True)
+        )
         
         return {
             'success': all(r.get('success', False) for r in results.values()),
@@ -704,6 +926,16 @@ class VideoWallLayoutManager:
         }
 
 
+def install_uvloop() -> bool:
+    """Switch the process to uvloop's event loop policy if uvloop is installed"""
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
 # Usage Example and Integration
 async def main():
     """Example usage of the Samsung LHB55ECH adapter and components"""
@@ -766,4 +998,5 @@ async def main():
         await adapter.disconnect()
 
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(main())
\ No newline at end of file
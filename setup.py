@@ -40,6 +40,9 @@ setup(
             "flake8>=6.0.0",
             "mypy>=1.0.0",
         ],
+        "uvloop": [
+            "uvloop>=0.17.0; sys_platform != 'win32'",
+        ],
     },
     entry_points={
         "console_scripts": [